@@ -17,20 +17,79 @@
 
 
 # ── STEP 1: IMPORT TOOLS ──────────────────────────────────────
-# We import 'csv' to save/read data like a spreadsheet
+# We import 'csv' to read data saved like a spreadsheet
+# We import 'json' to save the running totals in a small side file
 # We import 'os' to check if a file exists on the computer
-# We import 'datetime' to get today's date automatically
+# We import 'marshal' to save a fast-loading copy of the expenses
+# We import 'sys' to make comparing categories quicker
+# and to print big tables in one go
+# We import 'time' to get today's date automatically
+# We import 'array' to store amounts as a compact list of whole numbers
+# We import 'Counter' to add up totals per category
 
 import csv
+import json
+import marshal
 import os
-from datetime import datetime
+import sys
+import time
+from array import array
+from collections import Counter
 
 
 # ── STEP 2: SET UP CONSTANTS ──────────────────────────────────
 # A constant is a value that never changes in the program
 # We store the filename here so we only need to change it once
 
-FILE_NAME = "expenses.csv"   # All expenses will be saved here
+FILE_NAME    = "expenses.csv"            # All expenses will be saved here
+SUMMARY_FILE = "expenses.summary.json"   # Running totals per category
+
+READ_BUFFER_SIZE = 1024 * 1024   # Read the file in 1 MB chunks
+
+# The biggest single expense we accept: $1,000,000,000.00 (in cents)
+MAX_CENTS = 100_000_000_000
+
+# The first line of every expense file, exactly as we write it
+_HEADER = "Date,Category,Amount,Description\r\n"
+
+# A quick-to-load copy of the expenses, saved in Python's own binary
+# format (marshal). The CSV is still the real record — the snapshot is
+# only used when it matches the CSV exactly, and is rebuilt otherwise.
+SNAPSHOT_FILE = "expenses.snapshot"
+
+# Change CACHE_VERSION whenever the shape of the data saved in the
+# snapshot or summary file changes, so old copies are rebuilt
+CACHE_VERSION = 4
+
+# Divider lines used when printing tables
+# Building them once here saves rebuilding them every time a menu is shown
+_SEP35 = "  " + "-"*35
+_SEP40 = "  " + "-"*40
+_SEP55 = "  " + "-"*55
+_SEP65 = "  " + "-"*65
+_SEP45 = "="*45
+
+# Summary bars for every possible length, one █ per 5% of spending
+# (0% → "", 100% → 20 blocks), so the summary just picks one out
+_BARS = ["█"*i for i in range(21)]
+
+# A small in-memory cache of the loaded expenses
+# We remember the file's modification time and size when we read it,
+# so if the file hasn't changed we can skip re-reading it
+# "skipped" is True if some rows couldn't be read, so we never save them
+# as a snapshot (the warning then shows again until the file is fixed)
+# "dirty" is True once expenses were added since the snapshot was saved
+_CACHE = {"mtime": None, "size": None, "rows": None,
+          "skipped": False, "dirty": False}
+
+# Running totals per category, kept up to date as expenses are added
+# Stamped the same way as _CACHE, so the summary never has to re-add
+# every expense unless the file was changed by something else
+_TOTALS = {"mtime": None, "size": None, "totals": None, "count": 0}
+
+# The expense file stays open for adding new rows while the menu runs,
+# so we don't have to open and close it for every single expense
+_APPENDER = {"file": None}
 
 # These are the allowed spending categories
 # Using a list keeps our categories organised
@@ -43,6 +102,11 @@ CATEGORIES = [
     "Others"
 ]
 
+# The menu number for each category, as text: {"1": "Food", "2": "Transport", ...}
+# Looking up what the user typed here checks and converts it in one step
+_CAT_BY_KEY = {str(i + 1): category for i, category in enumerate(CATEGORIES)}
+_N_CATS     = len(CATEGORIES)
+
 
 # ── STEP 3: FILE FUNCTIONS ────────────────────────────────────
 # These functions handle saving and loading data from the CSV file
@@ -60,100 +124,512 @@ def setup_file():
         # 'newline=""' prevents extra blank lines in the CSV
         with open(FILE_NAME, "w", newline="") as file:
 
-            # csv.writer helps us write rows into the CSV
-            writer = csv.writer(file)
-
-            # writerow() writes one row — this is the header row
-            writer.writerow(["Date", "Category", "Amount", "Description"])
+            # Write the header row
+            file.write(_HEADER)
 
         print(f"  ✅ New expense file created: {FILE_NAME}")
 
 
-def save_expense(date, category, amount, description):
+def save_expense(date, category, cents, description):
     """
     Saves one expense entry to the CSV file.
+    'cents' is the amount as a whole number of cents, e.g. 550 for $5.50.
     'a' means append mode — adds to the file without deleting old data.
     """
-    # "a" = append mode, so we ADD to the file, not overwrite it
-    with open(FILE_NAME, "a", newline="") as file:
-        writer = csv.writer(file)
+    # If someone else changed the file since we last read it,
+    # our cached copy and running totals are out of date
+    stat = os.stat(FILE_NAME)
+    cache_is_fresh  = _cache_matches(stat)
+    totals_is_fresh = _totals_match(stat)
+
+    # Build the CSV line ourselves — quicker than going through csv.writer
+    # The date, category and amount never contain commas or quotes,
+    # so only the description might need quoting
+    # The CSV keeps a normal dollar amount like "5.50" so people can read it
+    # "\r\n" ends the line the same way csv.writer does
+    line = f"{date},{category},{cents_to_text(cents)},{_csv_field(description)}\r\n"
+
+    if _APPENDER["file"] is not None:
+        # The file is already open (see open_expense_file), just write
+        _APPENDER["file"].write(line)
+    else:
+        # "a" = append mode, so we ADD to the file, not overwrite it
+        with open(FILE_NAME, "a", newline="") as file:
+
+            # Write the new expense as a new row
+            file.write(line)
+
+    # The file's new time and size, now that the row is written
+    stat = os.stat(FILE_NAME)
+
+    # Keep the cache in sync instead of throwing it away,
+    # so the next view doesn't have to re-read the whole file
+    if not cache_is_fresh:
+        _CACHE["rows"] = None
+    else:
+        # Amount goes first: if the array can't hold it, we stop here
+        # before the other columns get out of step with each other
+        columns = _CACHE["rows"]
+        columns["Amount"].append(cents)
+        columns["Date"].append(date)
+        columns["Category"].append(category)
+        columns["Description"].append(description)
+        _CACHE["dirty"] = True
+        _CACHE["mtime"] = stat.st_mtime_ns
+        _CACHE["size"]  = stat.st_size
+
+    # Same for the running totals: just add the new amount on
+    if not totals_is_fresh:
+        _TOTALS["totals"] = None
+    else:
+        _TOTALS["totals"][category] += cents
+        _TOTALS["count"] += 1
+        _TOTALS["mtime"] = stat.st_mtime_ns
+        _TOTALS["size"]  = stat.st_size
+
+
+def _csv_field(text):
+    """
+    Quotes text for the CSV file if it needs it, the same way csv.writer
+    does, e.g. bus, home → "bus, home"
+    """
+    # Text with a comma, quote or line break must be wrapped in quotes,
+    # and any quotes inside are written twice
+    if "," in text or '"' in text or "\n" in text or "\r" in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def cents_to_text(cents):
+    """
+    Turns a whole number of cents into dollar text, e.g. 550 → "5.50".
+    Works for refunds too, e.g. -5 → "-0.05".
+    """
+    # Deal with the minus sign first, so the sums below only see
+    # positive numbers (// and % round negative numbers the other way)
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+
+    # // is whole-number division and % is the remainder
+    # :02d pads the cents with a zero, so 5 cents shows as "05"
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+def text_to_cents(text):
+    """
+    Turns dollar text from the CSV into whole cents, e.g. "5.5" → 550.
+    """
+    # round() fixes tiny float errors, e.g. 0.29 * 100 = 28.999999999999996
+    return round(float(text) * 100)
+
+
+def open_expense_file():
+    """
+    Opens the CSV file once for adding expenses, so save_expense()
+    can keep writing to it without reopening it every time.
+    """
+    # buffering=1 means "line buffered": every row is written to disk
+    # as soon as it is complete, so nothing is lost if the program crashes
+    _APPENDER["file"] = open(FILE_NAME, "a", newline="", buffering=1)
+
+
+def close_expense_file():
+    """
+    Closes the CSV file opened by open_expense_file().
+    """
+    if _APPENDER["file"] is not None:
+        _APPENDER["file"].close()
+    _APPENDER["file"] = None
+
+
+def _cache_matches(stat):
+    """
+    Returns True if the cached rows were loaded from a file with this
+    modification time and size (meaning the file hasn't changed since).
+    """
+    return (_CACHE["rows"] is not None
+            and _CACHE["mtime"] == stat.st_mtime_ns
+            and _CACHE["size"] == stat.st_size)
+
 
-        # Write the new expense as a new row
-        writer.writerow([date, category, amount, description])
+def _totals_match(stat):
+    """
+    Returns True if the running totals were worked out for a file with
+    this modification time and size.
+    """
+    return (_TOTALS["totals"] is not None
+            and _TOTALS["mtime"] == stat.st_mtime_ns
+            and _TOTALS["size"] == stat.st_size)
 
 
 def load_expenses():
     """
-    Reads ALL expenses from the CSV file and returns them as a list.
-    Each expense is a dictionary like:
-    {"Date": "2024-01-15", "Category": "Food", "Amount": 5.50, "Description": "Lunch"}
+    Reads ALL expenses from the CSV file and returns them as columns.
+    Each column is a list holding one field for every expense, like:
+    {"Date": ["2024-01-15", ...], "Category": ["Food", ...],
+     "Amount": array("q", [550, ...]), "Description": ["Lunch", ...]}
+    So the 3rd expense is made of the 3rd item of each column.
+    Amounts are whole cents (550 means $5.50), so adding them up is exact.
+    If the file hasn't changed since the last load, the cached list is reused.
     """
-    expenses = []   # Start with an empty list
+    # os.stat() tells us the file's modification time and size
+    # If both match what we saw last time, the file is unchanged
+    stat = os.stat(FILE_NAME)
+    if _cache_matches(stat):
+        return _CACHE["rows"]
+
+    # Next best is the snapshot saved last time the program ran
+    # Only if that is missing or out of date do we read the CSV itself
+    skipped = False
+    expenses = _load_snapshot(stat)
+    if expenses is None:
+        expenses, skipped = _read_csv_file()
+        if not skipped:
+            _save_snapshot(expenses, stat)
+
+    # Remember what we loaded for next time
+    # Either way, the snapshot on disk now matches what we loaded
+    _CACHE["rows"]    = expenses
+    _CACHE["skipped"] = skipped
+    _CACHE["dirty"]   = False
+    _CACHE["mtime"] = stat.st_mtime_ns
+    _CACHE["size"]  = stat.st_size
+
+    return expenses   # Return all the expense columns
+
+
+def _read_csv_file():
+    """
+    Reads every expense from the CSV file (the slow way, row by row).
+    Returns (expenses, skipped), where skipped is True if some rows had
+    no amount, or an amount we couldn't use, and were left out.
+    """
+    # One list per column, instead of one dictionary per expense
+    # array("q") stores whole numbers packed tightly, like a C array
+    dates        = []
+    categories   = []
+    amounts      = array("q")
+    descriptions = []
+    skipped      = False
 
     # Open the file in read mode ("r")
-    with open(FILE_NAME, "r") as file:
-
-        # csv.DictReader reads each row as a dictionary
-        # So we can use expense["Category"] instead of expense[1]
-        reader = csv.DictReader(file)
+    # A big read buffer means fewer trips to the disk for large files
+    with open(FILE_NAME, "r", newline="", buffering=READ_BUFFER_SIZE) as file:
+
+        # csv.reader reads each row as a plain list like
+        # ["2024-01-15", "Food", "5.5", "Lunch"], which is cheaper
+        # than csv.DictReader building a dictionary for every row
+        reader = csv.reader(file)
+
+        # Skip the header row
+        # Usually it's exactly the header we wrote, so we just read past it
+        # If it looks different (e.g. the file was saved by a spreadsheet
+        # program), go back to the start and let csv skip it properly
+        # reader.line_num counts the lines csv has read, so when we skip
+        # the header ourselves it's one behind the real line number
+        lines_before = 1
+        if file.read(len(_HEADER)) != _HEADER:
+            file.seek(0)
+            next(reader, None)
+            lines_before = 0
 
         # Loop through every row in the file
         for row in reader:
-            # Convert Amount from string to float (number with decimals)
+            if not row:
+                continue   # Skip blank lines
+
+            # A row needs at least a date, category and amount
+            # (a hand-edited file might leave some of them out)
+            if len(row) < 3:
+                line = reader.line_num + lines_before
+                print(f"  ⚠️  Skipping line {line} in {FILE_NAME}: "
+                      f"it has no amount.")
+                skipped = True
+                continue
+
+            # Convert Amount from text like "5.50" to whole cents (550)
             # CSV files store everything as text, so we need to convert
-            row["Amount"] = float(row["Amount"])
-            expenses.append(row)   # Add this expense to our list
+            # Amount goes first: if it isn't a number, or is too big for
+            # the array, we skip the row before touching the other columns
+            try:
+                amounts.append(text_to_cents(row[2]))
+            except (ValueError, OverflowError):
+                line = reader.line_num + lines_before
+                print(f"  ⚠️  Skipping line {line} in {FILE_NAME}: "
+                      f"can't use amount {row[2]!r}.")
+                skipped = True
+                continue
+
+            # Add the other fields of the row to their own columns
+            # sys.intern() makes every "Food" share one string object,
+            # which saves memory and makes comparing categories quicker
+            dates.append(row[0])
+            categories.append(sys.intern(row[1]))
+            # The description may be missing too — use the same default
+            # as add_expense() instead of stopping with an error
+            descriptions.append(row[3] if len(row) > 3 else "No description")
+
+    expenses = {
+        "Date":        dates,
+        "Category":    categories,
+        "Amount":      amounts,
+        "Description": descriptions,
+    }
+    return expenses, skipped
+
+
+def _load_snapshot(stat):
+    """
+    Reads the expenses saved in SNAPSHOT_FILE.
+    Returns None if the snapshot is missing, broken, or doesn't match
+    the CSV file described by 'stat'.
+    """
+    # marshal can only hold plain data (text, numbers, lists, bytes...),
+    # so unlike pickle, loading a snapshot can never run any code
+    try:
+        with open(SNAPSHOT_FILE, "rb") as file:
+            snapshot = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        # A missing or damaged snapshot is not a problem —
+        # we can always rebuild it from the CSV file
+        return None
+
+    if (not isinstance(snapshot, dict)
+            or snapshot.get("version") != CACHE_VERSION
+            or snapshot.get("csv_mtime") != stat.st_mtime_ns
+            or snapshot.get("csv_size") != stat.st_size):
+        return None
+
+    dates        = snapshot.get("Date")
+    categories   = snapshot.get("Category")
+    amount_bytes = snapshot.get("Amount")
+    descriptions = snapshot.get("Description")
+    if (not isinstance(dates, list)
+            or not isinstance(categories, list)
+            or not isinstance(amount_bytes, bytes)
+            or not isinstance(descriptions, list)):
+        return None
+
+    # The amounts were saved as the raw bytes of the array, so we can
+    # turn them straight back into an array without converting each one
+    amounts = array("q")
+    try:
+        amounts.frombytes(amount_bytes)
+    except ValueError:
+        return None
+
+    if not len(dates) == len(categories) == len(amounts) == len(descriptions):
+        return None
+
+    return {
+        "Date":        dates,
+        "Category":    [sys.intern(category) for category in categories],
+        "Amount":      amounts,
+        "Description": descriptions,
+    }
+
+
+def _save_snapshot(expenses, stat):
+    """
+    Saves the expenses to SNAPSHOT_FILE, stamped with the time and size
+    of the CSV file they were read from.
+    """
+    snapshot = {
+        "version":     CACHE_VERSION,
+        "csv_mtime":   stat.st_mtime_ns,
+        "csv_size":    stat.st_size,
+        "Date":        expenses["Date"],
+        "Category":    expenses["Category"],
+        "Amount":      expenses["Amount"].tobytes(),
+        "Description": expenses["Description"],
+    }
+
+    # Same trick as the summary: write a temporary file, then swap it in
+    temp_name = SNAPSHOT_FILE + ".tmp"
+    with open(temp_name, "wb") as file:
+        marshal.dump(snapshot, file)
+    os.replace(temp_name, SNAPSHOT_FILE)
+
+
+def save_snapshot():
+    """
+    Saves the cached expenses as a snapshot so the next run can skip
+    reading the CSV. Does nothing if no expenses were added since the
+    snapshot was last saved, or if the cache is empty, out of date, or
+    is missing rows that couldn't be read.
+    """
+    if not _CACHE["dirty"] or not os.path.exists(FILE_NAME):
+        return
+
+    stat = os.stat(FILE_NAME)
+    if _cache_matches(stat) and not _CACHE["skipped"]:
+        _save_snapshot(_CACHE["rows"], stat)
+        _CACHE["dirty"] = False
+
+
+def _load_summary(stat):
+    """
+    Reads the saved running totals from SUMMARY_FILE.
+    Returns None if the file is missing, broken, or doesn't match the
+    CSV file described by 'stat' (so it can't be trusted).
+    """
+    try:
+        with open(SUMMARY_FILE, "r") as file:
+            summary = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    # The summary remembers the expense file's time and size when it was saved
+    # If they don't match now, expenses were changed behind our back
+    if (not isinstance(summary, dict)
+            or summary.get("version") != CACHE_VERSION
+            or summary.get("csv_mtime") != stat.st_mtime_ns
+            or summary.get("csv_size") != stat.st_size
+            or not isinstance(summary.get("totals"), dict)
+            or not isinstance(summary.get("count"), int)):
+        return None
+
+    return summary
+
+
+def _save_summary(category_totals, count, stat):
+    """
+    Writes the running totals to SUMMARY_FILE, stamped with the time and
+    size of the CSV file they were worked out from.
+    """
+    summary = {
+        "version":   CACHE_VERSION,
+        "csv_mtime": stat.st_mtime_ns,
+        "csv_size":  stat.st_size,
+        "count":     count,
+        "totals":    dict(category_totals),
+    }
+
+    # Write to a temporary file first, then swap it into place
+    # This way a crash can never leave a half-written summary behind
+    temp_name = SUMMARY_FILE + ".tmp"
+    with open(temp_name, "w") as file:
+        json.dump(summary, file)
+    os.replace(temp_name, SUMMARY_FILE)
+
+
+def load_totals():
+    """
+    Returns (category_totals, grand_total, count) for all expenses.
+    Uses the running totals in memory, or else the ones saved in
+    SUMMARY_FILE, when they are up to date; otherwise adds up every
+    expense once. After that, save_expense() keeps them up to date.
+    """
+    stat = os.stat(FILE_NAME)
+
+    if not _totals_match(stat):
+        summary = _load_summary(stat)
+        if summary is not None:
+            category_totals = Counter(summary["totals"])
+            count = summary["count"]
+        else:
+            expenses = load_expenses()
+            category_totals, _ = total_by_category(expenses)
+            count = len(expenses["Amount"])
+
+        _TOTALS["totals"] = category_totals
+        _TOTALS["count"]  = count
+        _TOTALS["mtime"]  = stat.st_mtime_ns
+        _TOTALS["size"]   = stat.st_size
 
-    return expenses   # Return the full list of expenses
+    # Only a handful of categories to add up, however many expenses there are
+    category_totals = _TOTALS["totals"]
+    grand_total = sum(category_totals.values())
+    return category_totals, grand_total, _TOTALS["count"]
+
+
+def save_summary():
+    """
+    Saves the running totals to SUMMARY_FILE so the next run can start
+    from them. Does nothing if they are missing or out of date, or were
+    added up from expenses with some rows skipped.
+    """
+    if not os.path.exists(FILE_NAME):
+        return
+
+    stat = os.stat(FILE_NAME)
+    partial = _cache_matches(stat) and _CACHE["skipped"]
+    if _totals_match(stat) and not partial:
+        _save_summary(_TOTALS["totals"], _TOTALS["count"], stat)
+
+
+def total_by_category(expenses):
+    """
+    Adds up the amounts for each category in one pass over the expenses.
+    Returns (category_totals, grand_total), where category_totals is a
+    Counter of cents like {"Food": 1250, "Transport": 325, ...}
+    """
+    # A Counter is a dictionary made for adding things up
+    # We start each category at 0 so they are shown in the usual order
+    category_totals = Counter({category: 0 for category in CATEGORIES})
+
+    # Loop through all expenses and add amounts to the right category
+    # zip() walks the two columns side by side, one expense at a time
+    for category, amount in zip(expenses["Category"], expenses["Amount"]):
+        category_totals[category] += amount
+
+    # The grand total is just all the category totals added together
+    grand_total = sum(category_totals.values())
+
+    return category_totals, grand_total
 
 
 # ── STEP 4: CORE FEATURES ────────────────────────────────────
 
+def pick_category():
+    """
+    Shows the numbered categories and asks until the user picks one.
+    Returns the chosen category, e.g. "Food".
+    """
+    for i, category in enumerate(CATEGORIES):
+        # enumerate() gives us both the index (i) and the value (category)
+        print(f"    {i+1}. {category}")
+
+    # Keep asking until user picks a valid category number
+    while True:
+        # input() gets text from the user
+        # .get() gives the category for that number, or None if there isn't one
+        category = _CAT_BY_KEY.get(input(f"\n  Pick a category (1-{_N_CATS}): ").strip())
+        if category is not None:
+            return category
+
+        print(f"  ⚠️  Please pick a number between 1 and {_N_CATS}.")
+
+
 def add_expense():
     """
     Asks the user to enter a new expense and saves it.
     """
     print("\n  ➕  ADD NEW EXPENSE")
-    print("  " + "-"*35)
+    print(_SEP35)
 
-    # Get today's date automatically using datetime
+    # Get today's date automatically using time
     # strftime() formats the date as "YYYY-MM-DD"
-    today = datetime.today().strftime("%Y-%m-%d")
+    today = time.strftime("%Y-%m-%d")
     print(f"  Date: {today}")
 
     # Show the categories with numbers so user can pick one
     print("\n  Categories:")
-    for i, category in enumerate(CATEGORIES):
-        # enumerate() gives us both the index (i) and the value (category)
-        print(f"    {i+1}. {category}")
-
-    # Keep asking until user picks a valid category number
-    while True:
-        try:
-            # input() gets text from the user
-            # int() converts that text to a whole number
-            choice = int(input("\n  Pick a category (1-6): "))
-
-            # Check if choice is within valid range
-            if 1 <= choice <= len(CATEGORIES):
-                category = CATEGORIES[choice - 1]   # -1 because lists start at 0
-                break   # Exit the while loop
-            else:
-                print("  ⚠️  Please pick a number between 1 and 6.")
-
-        except ValueError:
-            # ValueError happens if user types letters instead of numbers
-            print("  ⚠️  Please enter a number.")
+    category = pick_category()
 
     # Get the amount spent
     while True:
         try:
-            amount = float(input("  Amount spent (SGD): $"))
-            if amount > 0:
-                break
-            else:
+            # Amounts are kept as whole cents, e.g. "5.50" → 550
+            cents = text_to_cents(input("  Amount spent (SGD): $"))
+            if cents <= 0:
                 print("  ⚠️  Amount must be more than 0.")
-        except ValueError:
+            elif cents > MAX_CENTS:
+                print(f"  ⚠️  Amount must be at most ${cents_to_text(MAX_CENTS)}.")
+            else:
+                break
+        except (ValueError, OverflowError):
+            # OverflowError happens for silly inputs like "1e999" (infinity)
             print("  ⚠️  Please enter a valid number.")
 
     # Get a short description
@@ -162,8 +638,8 @@ def add_expense():
         description = "No description"   # Default if user skips it
 
     # Save everything to the file
-    save_expense(today, category, amount, description)
-    print(f"\n  ✅ Expense saved! ${amount:.2f} for {category} — {description}")
+    save_expense(today, category, cents, description)
+    print(f"\n  ✅ Expense saved! ${cents_to_text(cents)} for {category} — {description}")
 
 
 def view_all_expenses():
@@ -173,32 +649,37 @@ def view_all_expenses():
     expenses = load_expenses()
 
     # Check if there are any expenses at all
-    if len(expenses) == 0:
+    if len(expenses["Amount"]) == 0:
         print("\n  ℹ️  No expenses recorded yet. Add some first!")
         return   # Exit the function early
 
-    print("\n  📋  ALL EXPENSES")
-    print("  " + "-"*65)
+    # Printing thousands of lines one by one is slow, so we collect
+    # all the lines in a list first and print them in one go at the end
+    lines = []
+
+    lines.append("\n  📋  ALL EXPENSES\n")
+    lines.append(_SEP65 + "\n")
     # f-strings let us format text with padding using < and >
-    print(f"  {'Date':<12} {'Category':<14} {'Amount':>8}  Description")
-    print("  " + "-"*65)
+    lines.append(f"  {'Date':<12} {'Category':<14} {'Amount':>8}  Description\n")
+    lines.append(_SEP65 + "\n")
 
-    total = 0   # We'll add up all amounts
+    # zip() walks all four columns side by side, one expense at a time
+    rows = zip(expenses["Date"], expenses["Category"],
+               expenses["Amount"], expenses["Description"])
 
-    for expense in expenses:
-        # Access dictionary values using the key names
-        date        = expense["Date"]
-        category    = expense["Category"]
-        amount      = expense["Amount"]
-        description = expense["Description"]
+    for date, category, amount, description in rows:
+        # Amounts are in cents, so divide by 100 to show dollars
+        # :.2f formats numbers to 2 decimal places e.g. 5.5 → 5.50
+        lines.append(f"  {date:<12} {category:<14} ${amount / 100:>7.2f}  {description}\n")
 
-        total += amount   # Add to running total
+    # sum() adds up the whole Amount column in one go
+    total = sum(expenses["Amount"])
 
-        # :.2f formats numbers to 2 decimal places e.g. 5.5 → 5.50
-        print(f"  {date:<12} {category:<14} ${amount:>7.2f}  {description}")
+    lines.append(_SEP65 + "\n")
+    lines.append(f"  {'TOTAL':<27} ${total / 100:>7.2f}\n")
 
-    print("  " + "-"*65)
-    print(f"  {'TOTAL':<27} ${total:>7.2f}")
+    # "".join() glues all the lines into one big string
+    sys.stdout.write("".join(lines))
 
 
 def view_summary():
@@ -206,46 +687,39 @@ def view_summary():
     Shows a summary — total per category and overall spending.
     Great for understanding where money is going.
     """
-    expenses = load_expenses()
+    category_totals, grand_total, count = load_totals()
 
-    if len(expenses) == 0:
+    if count == 0:
         print("\n  ℹ️  No expenses to summarise yet.")
         return
 
     print("\n  📊  SPENDING SUMMARY")
-    print("  " + "-"*40)
-
-    # A dictionary to store total per category
-    # We start each category at 0
-    category_totals = {}
-    for category in CATEGORIES:
-        category_totals[category] = 0   # e.g. {"Food": 0, "Transport": 0 ...}
-
-    grand_total = 0
-
-    # Loop through all expenses and add amounts to the right category
-    for expense in expenses:
-        cat    = expense["Category"]
-        amount = expense["Amount"]
-        category_totals[cat] += amount   # Add to that category's total
-        grand_total           += amount  # Add to overall total
+    print(_SEP40)
 
     # Display the summary
     for category, total in category_totals.items():
         if total > 0:   # Only show categories that have spending
+            # If refunds cancel out all the spending (or more), there is
+            # no sensible percentage — show just the amount
+            if grand_total <= 0:
+                print(f"  {category:<14} ${total / 100:>7.2f}")
+                continue
+
             # Calculate percentage of total spending
             percentage = (total / grand_total) * 100
 
             # Visual bar made of █ characters
-            bar = "█" * int(percentage // 5)
+            # Keep the length between 0 and 20 so refunds (negative
+            # percentages) just show no bar
+            bar = _BARS[max(0, min(int(percentage // 5), 20))]
 
-            print(f"  {category:<14} ${total:>7.2f}  {percentage:>5.1f}%  {bar}")
+            print(f"  {category:<14} ${total / 100:>7.2f}  {percentage:>5.1f}%  {bar}")
 
-    print("  " + "-"*40)
-    print(f"  {'GRAND TOTAL':<14} ${grand_total:>7.2f}")
+    print(_SEP40)
+    print(f"  {'GRAND TOTAL':<14} ${grand_total / 100:>7.2f}")
 
-    # Find the highest spending category using max()
-    highest_cat = max(category_totals, key=category_totals.get)
+    # most_common(1) gives us the single biggest (category, total) pair
+    highest_cat = category_totals.most_common(1)[0][0]
     print(f"\n  💸 You spend the most on: {highest_cat}")
 
 
@@ -254,80 +728,89 @@ def view_by_category():
     Filter and show expenses for one specific category.
     """
     print("\n  🔍  FILTER BY CATEGORY")
-    print("  " + "-"*35)
+    print(_SEP35)
 
-    for i, category in enumerate(CATEGORIES):
-        print(f"    {i+1}. {category}")
-
-    while True:
-        try:
-            choice = int(input("\n  Pick a category (1-6): "))
-            if 1 <= choice <= len(CATEGORIES):
-                selected = CATEGORIES[choice - 1]
-                break
-            else:
-                print("  ⚠️  Pick between 1 and 6.")
-        except ValueError:
-            print("  ⚠️  Numbers only.")
+    selected = pick_category()
 
     expenses = load_expenses()
 
     # Filter — only keep expenses matching the selected category
     # This is called "list comprehension" — a short way to filter a list
-    filtered = [e for e in expenses if e["Category"] == selected]
+    # Categories are interned when loaded (see _read_csv_file), so
+    # == usually succeeds straight away by seeing it's the same string
+    selected = sys.intern(selected)
+    rows = zip(expenses["Category"], expenses["Date"],
+               expenses["Amount"], expenses["Description"])
+    filtered = [row[1:] for row in rows if row[0] == selected]
 
     if len(filtered) == 0:
         print(f"\n  ℹ️  No expenses found for {selected}.")
         return
 
     print(f"\n  📋  {selected.upper()} EXPENSES")
-    print("  " + "-"*55)
+    print(_SEP55)
 
     total = 0
-    for expense in filtered:
-        amount = expense["Amount"]
+    for date, amount, description in filtered:
         total += amount
-        print(f"  {expense['Date']}  ${amount:>7.2f}  {expense['Description']}")
+        print(f"  {date}  ${amount / 100:>7.2f}  {description}")
 
-    print("  " + "-"*55)
-    print(f"  Total spent on {selected}: ${total:.2f}")
+    print(_SEP55)
+    print(f"  Total spent on {selected}: ${cents_to_text(total)}")
 
 
 # ── STEP 5: MAIN MENU ─────────────────────────────────────────
 # This is the control centre of the whole program
 
+# Which function runs for each menu choice
+# Functions are values too, so we can store them in a dictionary
+HANDLERS = {
+    "1": add_expense,
+    "2": view_all_expenses,
+    "3": view_summary,
+    "4": view_by_category,
+}
+
 def print_header():
-    print("\n" + "="*45)
+    print("\n" + _SEP45)
     print("   💰  Personal Expense Tracker")
-    print("="*45)
+    print(_SEP45)
 
 def main():
     # Run setup first — creates file if needed
     setup_file()
+    open_expense_file()
     print_header()
 
-    # while True creates an infinite loop
-    # The program keeps showing the menu until user exits
-    while True:
-        print("\n  MENU")
-        print("  1. Add new expense")
-        print("  2. View all expenses")
-        print("  3. View spending summary")
-        print("  4. Filter by category")
-        print("  5. Exit")
-
-        choice = input("\n  Enter choice (1-5): ").strip()
-
-        # Match the choice to the right function
-        if   choice == "1": add_expense()
-        elif choice == "2": view_all_expenses()
-        elif choice == "3": view_summary()
-        elif choice == "4": view_by_category()
-        elif choice == "5":
-            print("\n  Goodbye! Keep saving money! 👋\n")
-            break   # break exits the while loop
-        else:
-            print("  ⚠️  Invalid choice. Please enter 1-5.")
+    # try/finally makes sure the file is closed even if something goes wrong
+    try:
+        # while True creates an infinite loop
+        # The program keeps showing the menu until user exits
+        while True:
+            print("\n  MENU")
+            print("  1. Add new expense")
+            print("  2. View all expenses")
+            print("  3. View spending summary")
+            print("  4. Filter by category")
+            print("  5. Exit")
+
+            choice = input("\n  Enter choice (1-5): ").strip()
+
+            if choice == "5":
+                print("\n  Goodbye! Keep saving money! 👋\n")
+                break   # break exits the while loop
+
+            # Look up the right function for the choice in HANDLERS
+            # .get() gives None instead of an error if the choice isn't there
+            handler = HANDLERS.get(choice)
+            if handler is not None:
+                handler()
+            else:
+                print("  ⚠️  Invalid choice. Please enter 1-5.")
+    finally:
+        close_expense_file()
+        save_snapshot()
+        save_summary()
 
 
 # ── STEP 6: RUN THE PROGRAM ───────────────────────────────────